@@ -1,11 +1,24 @@
+import codecs
 import io
 import re
+from copy import deepcopy
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import zip_longest
 from pathlib import Path
+from typing import BinaryIO
+from xml.sax.saxutils import escape, quoteattr
 import streamlit as st
+from charset_normalizer import from_bytes
 from pptx import Presentation
-from pptx.util import Inches, Pt, Cm
+from pptx.api import _default_pptx_path
+from pptx.util import Pt, Cm
 from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE, MSO_ANCHOR
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.oxml.slide import CT_Slide
+from pptx.parts.slide import SlidePart
 
 st.set_page_config(page_title="TXT → PPT", page_icon="🖼️", layout="centered")
 
@@ -13,245 +26,320 @@ st.title("TXT → PPTX generator")
 st.caption("Sorok/bekezdések → diák. Egynyelvű és kétnyelvű mód, tetszőleges tipográfia és színek.")
 
 # ---------- Helpers ----------
-def read_text_multi_enc(data: bytes) -> str:
-    for enc in ("utf-8", "cp1250", "iso-8859-2", "latin2"):
-        try:
-            return data.decode(enc)
-        except Exception:
-            continue
-    return data.decode("utf-8", errors="replace")
+_WIDE_TEMPLATE_PATH = Path(__file__).parent / "templates" / "widescreen.pptx"
+_BLANKLINE_RE = re.compile(r"\n\s*\n")
+_TS_RE = re.compile(r"^\s*\d{2}:\d{2}:\d{2},\d{3}\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}\s*$")
+# sor eleji whitespace (CRLF, behúzás, bármilyen Unicode szóköz) esetén kell a _BLANKLINE_RE
+_LEADING_WS_RE = re.compile(r"\n[^\S\n]")
 
+@st.cache_data(max_entries=8, show_spinner=False)
+def read_text_multi_enc(data: bytes) -> str:
+    if data.startswith(codecs.BOM_UTF8):
+        return data.decode("utf-8-sig")
+    if data.isascii():
+        return data.decode("ascii")
+    try:
+        # szigorú UTF-8: egy C menet, nem UTF-8 bemeneten hamar elbukik
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    # detektálás csak a maradékra, a közép-európai kódlapokra szűkítve
+    best = from_bytes(data, cp_isolation=["cp1250", "iso8859_2"]).best()
+    if best is None:
+        return data.decode("cp1250", errors="replace")
+    return str(best)
+
+def _split_paragraphs(s: str):
+    if _LEADING_WS_RE.search(s):
+        return _BLANKLINE_RE.split(s)
+    return s.split("\n\n")
+
+@st.cache_data(max_entries=8, show_spinner=False)
 def parse_text(content: str, mode: str, preserve_blanks: bool):
     if mode == "srt":
-        blocks = re.split(r"\n\s*\n", content.strip(), flags=re.MULTILINE)
+        blocks = _split_paragraphs(content.strip())
         out = []
-        ts_re = re.compile(r"^\s*\d{2}:\d{2}:\d{2},\d{3}\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}\s*$")
         for b in blocks:
             lines = []
             for ln in b.splitlines():
                 s = ln.strip()
-                if not s or s.isdigit() or ts_re.match(s):
+                if not s or s.isdigit():
+                    continue
+                # olcsó előszűrés: a regex csak időbélyeg-gyanús sorokon fut
+                if len(s) >= 27 and s[2] == ":" and "-->" in s and _TS_RE.match(s):
                     continue
                 lines.append(s)
             if lines:
                 out.append(" ".join(lines))
         return out
     if mode == "para":
-        return [b.strip() for b in re.split(r"\n\s*\n", content) if b.strip()]
+        return [b.strip() for b in _split_paragraphs(content) if b.strip()]
     if preserve_blanks:
         return content.splitlines()
-    return [l.strip() for l in content.splitlines() if l.strip()]
+    return [s for l in content.splitlines() if (s := l.strip())]
 
+@st.cache_data(max_entries=8, show_spinner=False)
 def parse_bilingual(content: str, *, use_blank_as_separator: bool = True, blank_line_as_slide: bool = False):
     """
     Kétnyelvű párosítás:
       - Nem üres sorokat 2-esével párosítjuk: (line1, line2) -> egy dia.
       - Ha blank_line_as_slide=True: az üres sorok **önálló üres diát** jelentenek.
       - Ha use_blank_as_separator=True: az üres sorokat elválasztóként **eldobjuk** (nem zavarják a párosítást).
-    Visszatér: list, amelynek elemei:
-      - ("", "") -> üres dia jelzés
-      - (line1, line2) vagy (line1, "") ha páratlan maradt
+    Visszatér: (pairs, blanks)
+      - pairs: list, elemei (line1, line2) vagy (line1, "") ha páratlan maradt
+      - blanks: frozenset azokkal az indexekkel, ahol üres dia kell (ott pairs eleme ("", ""))
     """
     raw_lines = content.splitlines()
 
     if blank_line_as_slide:
         pairs = []
-        buf = []
+        blanks = set()
+        pending = None
         for ln in raw_lines:
             s = ln.strip()
-            if s == "":
+            if not s:
                 # üres dia
+                blanks.add(len(pairs))
                 pairs.append(("", ""))
-                continue
-            buf.append(s)
-            if len(buf) == 2:
-                pairs.append((buf[0], buf[1]))
-                buf = []
-        if buf:  # páratlan maradt
-            pairs.append((buf[0], ""))
-        return pairs
+            elif pending is None:
+                pending = s
+            else:
+                pairs.append((pending, s))
+                pending = None
+        if pending is not None:  # páratlan maradt
+            pairs.append((pending, ""))
+        return pairs, frozenset(blanks)
     else:
         # nincs üres dia, üreseket dobjuk-e?
-        lines = [ln.strip() for ln in raw_lines if (ln.strip() != "" or not use_blank_as_separator)]
-        pairs = []
-        i = 0
-        while i < len(lines):
-            l1 = lines[i]
-            l2 = lines[i+1] if i+1 < len(lines) else ""
-            pairs.append((l1, l2))
-            i += 2
-        return pairs
-
-def add_background_slide(prs: Presentation, bg_rgb=(0,0,0)):
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    fill = slide.background.fill
-    fill.solid()
-    fill.fore_color.rgb = RGBColor(*bg_rgb)
-    return slide
-
-def add_textbox(
-    slide, text, *,
-    area_left, area_top, area_width, area_height,
-    font_name="Arial", font_size_pt=44, font_rgb=(255,255,255),
-    bold=False, italic=False,
+        if use_blank_as_separator:
+            lines = [s for ln in raw_lines if (s := ln.strip())]
+        else:
+            lines = [ln.strip() for ln in raw_lines]
+        return list(zip_longest(lines[0::2], lines[1::2], fillvalue="")), frozenset()
+
+def _hex_rgb(h: str):
+    return tuple(bytes.fromhex(h.lstrip("#")))
+
+_BACKGROUND_XML = (
+    '<p:bg {nsdecls}><p:bgPr><a:solidFill><a:srgbClr val="{rgb_hex}"/></a:solidFill><a:effectLst/></p:bgPr></p:bg>'
+)
+
+def background_template(prs: Presentation, bg_rgb=(0,0,0)):
+    """Háttérszínnel kitöltött üres dia (layout, <p:sld>) párosa.
+
+    Paklinként egyszer épül fel; add_background_slide ennek másolatából készít diát.
+    """
+    sld = CT_Slide.new()
+    sld.cSld.insert(0, parse_xml(_BACKGROUND_XML.format(
+        nsdecls=nsdecls("a", "p"), rgb_hex=str(RGBColor(*bg_rgb))
+    )))
+    return prs.slide_layouts[6], sld
+
+def add_background_slide(prs: Presentation, background):
+    # prs.slides.add_slide minden hívásnál végignézi az összes relációt és dia-azonosítót,
+    # ami hosszú feliratfájloknál négyzetes; itt csak hozzáfűzünk
+    layout, sld = background
+    pres_part = prs.part
+    sld_id_lst = prs.slides._sldIdLst
+    slide_part = SlidePart(pres_part._next_slide_partname, CT.PML_SLIDE, pres_part.package, deepcopy(sld))
+    slide_part.relate_to(layout.part, RT.SLIDE_LAYOUT)
+    rId = pres_part.rels._add_relationship(RT.SLIDE, slide_part)
+    last_id = sld_id_lst[-1].id if len(sld_id_lst) else 255
+    sld_id_lst._add_sldId(id=last_id + 1, rId=rId)
+    return slide_part.slide
+
+# a szövegdoboz XML három része: diánként a fej (azonosító, geometria) és a futamok változnak,
+# a txBody eleje (bodyPr, pPr) paklinként egyszer készül el a textbox_style-ban
+_TEXTBOX_HEAD_XML = (
+    '<p:sp {nsdecls}><p:nvSpPr><p:cNvPr id="{id}" name="TextBox {name_idx}"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="{left}" y="{top}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+)
+_TEXTBOX_BODY_XML = (
+    '<p:txBody><a:bodyPr wrap="square" tIns="0" bIns="0" lIns="0" rIns="0" anchor="{anchor}">{autofit}</a:bodyPr><a:lstStyle/>'
+    '<a:p><a:pPr algn="{align}"><a:defRPr sz="{size}" b="{bold}" i="{italic}">'
+    '<a:solidFill><a:srgbClr val="{rgb_hex}"/></a:solidFill><a:latin typeface={font_name}/></a:defRPr></a:pPr>'
+)
+_TEXTBOX_TAIL_XML = '</a:p></p:txBody></p:sp>'
+_TEXTBOX_NSDECLS = nsdecls("a", "p")
+_CTRL_CHAR_RE = re.compile(r"[\x00-\x08\x0B-\x1F]")
+
+_RUN_XML = "<a:r><a:t>{}</a:t></a:r>"
+
+def _runs_xml(text: str) -> str:
+    # gyakori eset: egy sor, vezérlőkarakter nélkül -> egyetlen futam
+    if text.isprintable():
+        return _RUN_XML.format(escape(text)) if text else ""
+    # a python-pptx p.text viselkedése: \n és \v -> sortörés, üres szakasz -> nincs futam
+    parts = []
+    for i, seg in enumerate(text.replace("\v", "\n").split("\n")):
+        if i:
+            parts.append("<a:br/>")
+        if seg:
+            seg = _CTRL_CHAR_RE.sub(lambda m: "_x%04X_" % ord(m.group()), seg)
+            parts.append(_RUN_XML.format(escape(seg)))
+    return "".join(parts)
+
+def textbox_style(
+    font=("Arial", Pt(44), (255,255,255), False, False), *,
     align_center=True, shrink_to_fit=True,
     vertical_position="bottom"   # "bottom" vagy "top"
 ):
-    tb = slide.shapes.add_textbox(area_left, area_top, area_width, area_height)
-    tf = tb.text_frame
-    tf.clear()
-    tf.word_wrap = True
-    tf.margin_top = tf.margin_bottom = tf.margin_left = tf.margin_right = 0
-
-    if vertical_position == "top":
-        tf.vertical_anchor = MSO_ANCHOR.TOP
-    else:
-        tf.vertical_anchor = MSO_ANCHOR.BOTTOM
-
-    if shrink_to_fit:
-        tf.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+    """A szövegdoboz txBody-jának eleje (bodyPr, pPr); paklinként egyszer számoljuk ki."""
+    font_name, font_size, font_rgb, bold, italic = font
+    return _TEXTBOX_BODY_XML.format(
+        anchor="t" if vertical_position == "top" else "b",
+        autofit="<a:normAutofit/>" if shrink_to_fit else "<a:spAutoFit/>",
+        align="ctr" if align_center else "l",
+        size=font_size.centipoints,
+        bold=int(bool(bold)), italic=int(bool(italic)),
+        rgb_hex=str(RGBColor(*font_rgb)),
+        font_name=quoteattr((font_name or "Arial").strip()),
+    )
 
-    p = tf.paragraphs[0]
-    p.text = text
-    p.font.name = (font_name or "Arial").strip()
-    p.font.size = Pt(float(font_size_pt))
-    p.font.color.rgb = RGBColor(*font_rgb)
-    p.font.bold = bool(bold)
-    p.font.italic = bool(italic)
-    p.alignment = PP_ALIGN.CENTER if align_center else PP_ALIGN.LEFT
+def add_textbox(slide, text, *, area_left, area_top, area_width, area_height, style):
+    # a shape XML-t egyben rakjuk össze, a python-pptx property setterek helyett
+    shape_id = slide.shapes._next_shape_id
+    head = _TEXTBOX_HEAD_XML.format(
+        nsdecls=_TEXTBOX_NSDECLS,
+        id=shape_id, name_idx=shape_id - 1,
+        left=int(area_left), top=int(area_top), cx=int(area_width), cy=int(area_height),
+    )
+    sp = parse_xml(head + style + _runs_xml(text) + _TEXTBOX_TAIL_XML)
+    slide.shapes._spTree.append(sp)
 
 def add_text_slide_single(
     prs: Presentation, text: str, *,
-    m_top_cm=0.13, m_bottom_cm=0.13, m_left_cm=0.25, m_right_cm=0.25,
-    font_name="Arial", font_size_pt=44, font_rgb=(255,255,255),
-    bold=False, italic=False,
-    bg_rgb=(0,0,0), align_center=True, shrink_to_fit=True,
-    vertical_position="bottom"
+    left, top, width, height,
+    style, background
 ):
-    slide = add_background_slide(prs, bg_rgb=bg_rgb)
-    sw, sh = prs.slide_width, prs.slide_height
-    left = Cm(m_left_cm)
-    width = sw - (Cm(m_left_cm) + Cm(m_right_cm))
-    height = sh - (Cm(m_top_cm) + Cm(m_bottom_cm))
-    top = Cm(m_top_cm)
-
+    slide = add_background_slide(prs, background)
     add_textbox(
         slide, text,
         area_left=left, area_top=top, area_width=width, area_height=height,
-        font_name=font_name, font_size_pt=font_size_pt, font_rgb=font_rgb,
-        bold=bold, italic=italic,
-        align_center=align_center, shrink_to_fit=shrink_to_fit,
-        vertical_position=vertical_position
+        style=style
     )
 
 def add_text_slide_bilingual(
     prs: Presentation, line1: str, line2: str, *,
-    m_left_cm=0.25, m_right_cm=0.25,
-    text_band_height_cm=2.5,
-    primary_offset_cm=0.0,
-    secondary_offset_cm=1.6,
-    primary_font=("Arial", 44, (255,255,255), False, False),
-    secondary_font=("Arial", 36, (200,200,200), False, False),
-    bg_rgb=(0,0,0),
-    align_center=True,
-    shrink_to_fit=True,
-    vertical_position="bottom"
+    left, width, band_height,
+    primary_top, secondary_top,
+    primary_style, secondary_style,
+    background
 ):
-    slide = add_background_slide(prs, bg_rgb=bg_rgb)
-    sw, sh = prs.slide_width, prs.slide_height
-
-    left = Cm(m_left_cm)
-    width = sw - (Cm(m_left_cm) + Cm(m_right_cm))
-    band_h = Cm(text_band_height_cm)
-
-    if vertical_position == "top":
-        # top-aligned: offset a dia tetejétől értendő
-        p_top = Cm(primary_offset_cm)
-        s_top = Cm(secondary_offset_cm)
-    else:
-        # bottom-aligned: offset a dia aljától értendő
-        p_top = sh - Cm(primary_offset_cm) - band_h
-        s_top = sh - Cm(secondary_offset_cm) - band_h
+    slide = add_background_slide(prs, background)
 
     add_textbox(
         slide, line1,
-        area_left=left, area_top=p_top, area_width=width, area_height=band_h,
-        font_name=primary_font[0], font_size_pt=primary_font[1], font_rgb=primary_font[2],
-        bold=primary_font[3], italic=primary_font[4],
-        align_center=align_center, shrink_to_fit=shrink_to_fit,
-        vertical_position=vertical_position
+        area_left=left, area_top=primary_top, area_width=width, area_height=band_height,
+        style=primary_style
     )
 
     add_textbox(
         slide, line2,
-        area_left=left, area_top=s_top, area_width=width, area_height=band_h,
-        font_name=secondary_font[0], font_size_pt=secondary_font[1], font_rgb=secondary_font[2],
-        bold=secondary_font[3], italic=secondary_font[4],
-        align_center=align_center, shrink_to_fit=shrink_to_fit,
-        vertical_position=vertical_position
+        area_left=left, area_top=secondary_top, area_width=width, area_height=band_height,
+        style=secondary_style
     )
 
-def build_ppt(
-    items,
-    *,
-    widescreen=True,
-    mode="single",
-    shrink_to_fit=True,
-    blank_slide_on_empty=False,
+@dataclass(frozen=True)
+class RenderSettings:
+    """Egy pakli összes beállítása; a méretek már EMU-ban, a színek (r, g, b) tuple-ként.
+
+    A betűtípusok (név, méret, szín, félkövér, dőlt) tuple-ök.
+    """
+    mode: str = "single"   # "single" vagy "bilingual"
+    widescreen: bool = True
+    shrink_to_fit: bool = True
+    blank_slide_on_empty: bool = False
+    bg_rgb: tuple = (0, 0, 0)
+    align_center: bool = True
+    vertical_position: str = "bottom"
+    m_left: int = Cm(0.25)
+    m_right: int = Cm(0.25)
     # single mode
-    m_top_cm=0.13, m_bottom_cm=0.13, m_left_cm=0.25, m_right_cm=0.25,
-    font_name="Arial", font_size_pt=44, font_rgb=(255,255,255),
-    single_bold=False, single_italic=False,
+    m_top: int = Cm(0.13)
+    m_bottom: int = Cm(0.13)
+    font: tuple = ("Arial", Pt(44), (255, 255, 255), False, False)
     # bilingual
-    bottom_band_height_cm=2.5,
-    primary_bottom_offset_cm=0.0, secondary_bottom_offset_cm=1.6,
-    primary_font=("Arial", 44, (255,255,255), False, False),
-    secondary_font=("Arial", 36, (200,200,200), False, False),
-    # common
-    bg_rgb=(0,0,0),
-    align_center=True,
-    vertical_position="bottom"
-) -> bytes:
-    prs = Presentation()
-    if widescreen:
-        prs.slide_width = Inches(13.33)
-        prs.slide_height = Inches(7.5)
-
-    if mode == "bilingual":
-        for item in items:
-            if isinstance(item, tuple):
-                l1, l2 = item
+    band_height: int = Cm(2.5)
+    primary_offset: int = Cm(0.0)
+    secondary_offset: int = Cm(1.6)
+    primary_font: tuple = ("Arial", Pt(44), (255, 255, 255), False, False)
+    secondary_font: tuple = ("Arial", Pt(36), (200, 200, 200), False, False)
+
+    def __post_init__(self):
+        # st.cache_data kulcsa: egyszer képzett bájtsor a mezők bejárása helyett
+        # (astuple nem jó: a deepcopy a Length értékeket újraskálázza)
+        values = tuple(getattr(self, f.name) for f in fields(self))
+        object.__setattr__(self, "_cache_key", repr(values).encode())
+
+@lru_cache(maxsize=2)
+def _template_bytes(widescreen: bool) -> bytes:
+    # a 16:9-es sablon a python-pptx alapsablonja 13.33 x 7.5 hüvelykes diamérettel
+    path = _WIDE_TEMPLATE_PATH if widescreen else _default_pptx_path()
+    return Path(path).read_bytes()
+
+def write_ppt(items, out: BinaryIO, settings: RenderSettings, blanks=frozenset()) -> None:
+    """blanks: kétnyelvű módban az üres diák indexei (lásd parse_bilingual)."""
+    prs = Presentation(io.BytesIO(_template_bytes(settings.widescreen)))
+
+    # a geometria diánként állandó: egyszer számoljuk ki EMU-ban
+    sw, sh = prs.slide_width, prs.slide_height
+    left = settings.m_left
+    width = sw - (left + settings.m_right)
+    background = background_template(prs, settings.bg_rgb)
+    box = dict(
+        align_center=settings.align_center, shrink_to_fit=settings.shrink_to_fit,
+        vertical_position=settings.vertical_position
+    )
+
+    if settings.mode == "bilingual":
+        band_h = settings.band_height
+        if settings.vertical_position == "top":
+            # top-aligned: offset a dia tetejétől értendő
+            p_top = settings.primary_offset
+            s_top = settings.secondary_offset
+        else:
+            # bottom-aligned: offset a dia aljától értendő
+            p_top = sh - settings.primary_offset - band_h
+            s_top = sh - settings.secondary_offset - band_h
+        p_style = textbox_style(settings.primary_font, **box)
+        s_style = textbox_style(settings.secondary_font, **box)
+
+        for idx, (l1, l2) in enumerate(items):
+            if idx in blanks:
+                add_background_slide(prs, background)
+            else:
                 add_text_slide_bilingual(
                     prs, l1, l2,
-                    m_left_cm=m_left_cm, m_right_cm=m_right_cm,
-                    text_band_height_cm=bottom_band_height_cm,
-                    primary_offset_cm=primary_bottom_offset_cm,
-                    secondary_offset_cm=secondary_bottom_offset_cm,
-                    primary_font=primary_font, secondary_font=secondary_font,
-                    bg_rgb=bg_rgb, align_center=align_center, shrink_to_fit=shrink_to_fit,
-                    vertical_position=vertical_position
+                    left=left, width=width, band_height=band_h,
+                    primary_top=p_top, secondary_top=s_top,
+                    primary_style=p_style, secondary_style=s_style,
+                    background=background
                 )
-            else:
-                # item == ("", "") eset helyett egy stringes jelzés is lehet – itt üres dia
-                add_background_slide(prs, bg_rgb=bg_rgb)
     else:
+        top = settings.m_top
+        height = sh - (top + settings.m_bottom)
+        style = textbox_style(settings.font, **box)
+
         for it in items:
-            if blank_slide_on_empty and (it.strip() == ""):
-                add_background_slide(prs, bg_rgb=bg_rgb)
+            if settings.blank_slide_on_empty and (it.strip() == ""):
+                add_background_slide(prs, background)
             else:
                 add_text_slide_single(
                     prs, it,
-                    m_top_cm=m_top_cm, m_bottom_cm=m_bottom_cm, m_left_cm=m_left_cm, m_right_cm=m_right_cm,
-                    font_name=font_name, font_size_pt=font_size_pt, font_rgb=font_rgb,
-                    bold=single_bold, italic=single_italic,
-                    bg_rgb=bg_rgb, align_center=align_center, shrink_to_fit=shrink_to_fit,
-                    vertical_position=vertical_position
+                    left=left, top=top, width=width, height=height,
+                    style=style, background=background
                 )
 
+    prs.save(out)
+
+@st.cache_data(max_entries=4, show_spinner=False, hash_funcs={RenderSettings: lambda s: s._cache_key})
+def build_ppt(items, settings: RenderSettings, blanks=frozenset()) -> bytes:
     bio = io.BytesIO()
-    prs.save(bio)
-    bio.seek(0)
-    return bio
+    write_ppt(items, bio, settings, blanks)
+    # a getvalue() másolás nélkül adja át a BytesIO pufferét, nem lesz két példány
+    return bio.getvalue()
 
 # ---------- UI ----------
 st.subheader("Forrás")
@@ -261,7 +349,7 @@ uploaded = None
 with tab1:
     f = st.file_uploader("Válassz .txt vagy .srt fájlt", type=["txt", "srt"])
     if f is not None:
-        data = f.read()
+        data = f.getvalue()
         text = read_text_multi_enc(data)
         uploaded = ("uploaded", text)
 
@@ -348,45 +436,40 @@ if st.button("PPTX generálása", type="primary", use_container_width=True):
         st.warning("Adj meg forrást (fájl vagy útvonal).")
     else:
         _, raw_text = uploaded
-        bg_rgb = tuple(int(bg_hex.lstrip("#")[i:i+2], 16) for i in (0,2,4))
+        common = dict(
+            widescreen=widescreen, shrink_to_fit=shrink,
+            bg_rgb=_hex_rgb(bg_hex), align_center=align_center,
+            vertical_position=caption_position,
+            m_left=Cm(m_left_cm), m_right=Cm(m_right_cm),
+        )
 
         if bilingual:
-            pairs = parse_bilingual(
+            pairs, blanks = parse_bilingual(
                 raw_text,
                 use_blank_as_separator=use_blank_sep,
                 blank_line_as_slide=bi_blankline_slide
             )
-            primary_font = (prim_font, prim_size, tuple(int(prim_hex.lstrip("#")[i:i+2], 16) for i in (0,2,4)),
-                            prim_bold, prim_italic)
-            secondary_font = (sec_font, sec_size, tuple(int(sec_hex.lstrip("#")[i:i+2], 16) for i in (0,2,4)),
-                              sec_bold, sec_italic)
-            pptx_bytes = build_ppt(
-                pairs,
-                widescreen=widescreen, mode="bilingual", shrink_to_fit=shrink,
-                m_left_cm=m_left_cm, m_right_cm=m_right_cm,
-                bottom_band_height_cm=bottom_band,
-                primary_bottom_offset_cm=prim_offset,
-                secondary_bottom_offset_cm=sec_offset,
-                primary_font=primary_font, secondary_font=secondary_font,
-                bg_rgb=bg_rgb, align_center=align_center,
-                vertical_position=caption_position
+            settings = RenderSettings(
+                mode="bilingual",
+                band_height=Cm(bottom_band),
+                primary_offset=Cm(prim_offset),
+                secondary_offset=Cm(sec_offset),
+                primary_font=(prim_font, Pt(prim_size), _hex_rgb(prim_hex), prim_bold, prim_italic),
+                secondary_font=(sec_font, Pt(sec_size), _hex_rgb(sec_hex), sec_bold, sec_italic),
+                **common
             )
-            st.success(f"Siker! {len([p for p in pairs if isinstance(p, tuple)])} kétnyelvű dia + "
-                       f"{len([p for p in pairs if not isinstance(p, tuple)])} üres dia.")
+            pptx_bytes = build_ppt(pairs, settings, blanks)
+            st.success(f"Siker! {len(pairs) - len(blanks)} kétnyelvű dia + {len(blanks)} üres dia.")
         else:
-            font_rgb = tuple(int(font_hex.lstrip("#")[i:i+2], 16) for i in (0,2,4))
             items = parse_text(raw_text, mode="line", preserve_blanks=blank_on_empty)
-            pptx_bytes = build_ppt(
-                items,
-                widescreen=widescreen, mode="single", shrink_to_fit=shrink,
+            settings = RenderSettings(
+                mode="single",
                 blank_slide_on_empty=blank_on_empty,
-                m_top_cm=m_top_cm, m_bottom_cm=m_bottom_cm,
-                m_left_cm=m_left_cm, m_right_cm=m_right_cm,
-                font_name=font_name, font_size_pt=font_size_pt, font_rgb=font_rgb,
-                single_bold=single_bold, single_italic=single_italic,
-                bg_rgb=bg_rgb, align_center=align_center,
-                vertical_position=caption_position
+                m_top=Cm(m_top_cm), m_bottom=Cm(m_bottom_cm),
+                font=(font_name, Pt(font_size_pt), _hex_rgb(font_hex), single_bold, single_italic),
+                **common
             )
+            pptx_bytes = build_ppt(items, settings)
             st.success(f"Siker! {len(items)} egynyelvű dia (az üres sorok külön diát kaphattak).")
 
         st.download_button(